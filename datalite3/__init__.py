@@ -1,6 +1,6 @@
 from .constraints import Primary, Unique
 from .decorator import datalite
-from .commons import DataLiteClass
+from .commons import DataLiteClass, close_connections
 
 __version__ = "1.0.1"
 
@@ -17,5 +17,7 @@ __all__ = [
     'Primary',
     'Unique',
     # classes
-    'DataLiteClass'
+    'DataLiteClass',
+    # functions
+    'close_connections',
 ]
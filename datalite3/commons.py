@@ -1,10 +1,15 @@
+import atexit
 import copy
+import logging
 import sqlite3 as sql
+import sys
+import threading
+import weakref
 from contextlib import contextmanager
 from enum import Enum
-from inspect import isclass
+from inspect import isclass, unwrap
 from sqlite3 import Connection
-from typing import Any, Dict, List, Tuple, Optional, Union, Type
+from typing import Any, Dict, List, Tuple, Optional, Union, Type, Callable, NamedTuple
 
 import dataclasses
 
@@ -17,14 +22,37 @@ DecoratedClass = Type[dataclasses.dataclass]
 
 MISSING = object()
 
+logger = logging.getLogger("datalite3")
+
 
 @dataclasses.dataclass
 class DataLiteClassParameters:
     auto_commit: bool
 
 
+class SchemaInfo(NamedTuple):
+    table_name: str
+    types_table: 'TypesTable'
+    fields: Tuple['SQLField', ...]
+    field_names: Tuple[str, ...]
+    primary: Tuple['SQLField', ...]
+    primary_names: Tuple[str, ...]
+    getter: Callable[[Any], Tuple[Any, ...]]
+    row_encoder: Callable[[Tuple[Any, ...]], Tuple[Any, ...]]
+    key_getter: Callable[[Any], Tuple[Any, ...]]
+    columns_ddl: Tuple[str, ...]
+    where_sql: str
+    insert_sql: str
+    update_sql: str
+    delete_sql: str
+    select_sql: str
+
+
 @dataclasses.dataclass
 class DataLiteClass:
+    # no instance storage of its own, so that slotted subclasses stay slotted
+    __slots__ = ()
+
     __commit__: dataclasses.InitVar[bool] = MISSING
 
     def __post_init__(self, __commit__: bool):
@@ -81,6 +109,57 @@ class DataLiteClass:
         raise NotImplementedError()
 
 
+def _get_slots(class_: type) -> Tuple[str, ...]:
+    slots = class_.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _make_slotted(class_: type, extra: Tuple[str, ...] = ()) -> type:
+    """
+    Rebuild a dataclass so that its instances keep their fields in
+    ``__slots__`` instead of a ``__dict__``.
+
+    :param class_: The dataclass to rebuild.
+    :param extra: Names of additional attributes that need a slot.
+    :return: The new class, with the same name, bases and methods.
+    """
+    inherited = {name for base in class_.__mro__[1:-1] for name in _get_slots(base)}
+    names = [f.name for f in dataclasses.fields(class_)] + list(extra)
+    # keep the instances weak-referenceable, unless a base already allows it
+    if not any("__weakref__" in base.__dict__ for base in class_.__mro__[1:-1]):
+        names.append("__weakref__")
+    slots = tuple(dict.fromkeys(name for name in names if name not in inherited))
+    namespace: Dict[str, Any] = dict(class_.__dict__)
+    # the defaults of the fields are class attributes and would shadow the slots
+    for name in slots:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = slots
+    slotted = type(class_)(class_.__name__, class_.__bases__, namespace)
+    slotted.__qualname__ = class_.__qualname__
+    # zero-argument super() looks the class up in the __class__ cell of the methods
+    for value in namespace.values():
+        _update_class_cell(value, class_, slotted)
+    return slotted
+
+
+def _update_class_cell(value: Any, old: type, new: type) -> None:
+    if isinstance(value, (classmethod, staticmethod)):
+        value = value.__func__
+    if isinstance(value, property):
+        for accessor in (value.fget, value.fset, value.fdel):
+            _update_class_cell(accessor, old, new)
+        return
+    value = unwrap(value) if callable(value) else value
+    code = getattr(value, "__code__", None)
+    if code is None or "__class__" not in code.co_freevars:
+        return
+    cell = value.__closure__[code.co_freevars.index("__class__")]
+    if cell.cell_contents is old:
+        cell.cell_contents = new
+
+
 class SQLType(Enum):
     NULL = "NULL"
     INTEGER = "INTEGER"
@@ -92,7 +171,11 @@ class SQLType(Enum):
         return self.value
 
 
-@dataclasses.dataclass
+# dataclasses support __slots__ starting with Python 3.10
+_slots: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclasses.dataclass(frozen=True, **_slots)
 class SQLField:
     name: str
     py_type: PythonType
@@ -103,14 +186,22 @@ class SQLField:
     def from_dataclass_field(f: dataclasses.Field,
                              type_overload: Optional['TypesTable'] = None) -> 'SQLField':
         table = type_overload or type_table
-        return SQLField(
-            f.name,
-            f.type,
-            table[f.type]
-        )
+        return SQLField(f.name, f.type, _convert_type(f.type, table),
+                        type_attributes.get(f.type, ""))
+
+    @property
+    def ddl(self) -> str:
+        """
+        The definition of the column bound to this field, e.g. ``name TEXT NOT NULL``.
+        """
+        sql_type: str = self.sql_type.value if isinstance(self.sql_type, SQLType) \
+            else str(self.sql_type)
+        attributes: str = f" {self.attributes}" if self.attributes else ""
+        return f"{self.name} {sql_type}{attributes}"
 
 
 TypesTable = Dict[PythonType, SQLType]
+Encoders = Dict[str, Callable[[Any], Any]]
 
 primitive_types: TypesTable = {
     type(None): SQLType.NULL,
@@ -120,16 +211,19 @@ primitive_types: TypesTable = {
     bytes: SQLType.BLOB
 }
 
+_primitive_items: List[Tuple[PythonType, SQLType]] = list(primitive_types.items())
+unique_types: TypesTable = {Unique[key]: value for key, value in _primitive_items}
+primary_types: TypesTable = {Primary[key]: value for key, value in _primitive_items}
+
 type_table: TypesTable = copy.copy(primitive_types)
-unique_types: TypesTable = {
-    Unique[key]: f"{value} NOT NULL UNIQUE" for key, value in primitive_types.items()
-}
-primary_types: TypesTable = {
-    Primary[key]: f"{value} NOT NULL" for key, value in primitive_types.items()
-}
 type_table.update(unique_types)
 type_table.update(primary_types)
 
+# column constraints implied by the constraint types
+type_attributes: Dict[PythonType, str] = {}
+type_attributes.update({key: "NOT NULL UNIQUE" for key in unique_types})
+type_attributes.update({key: "NOT NULL" for key in primary_types})
+
 
 def _convert_type(type_: PythonType, type_overload: TypesTable) -> SQLType:
     """
@@ -147,6 +241,16 @@ def _convert_type(type_: PythonType, type_overload: TypesTable) -> SQLType:
         raise TypeError("Requested type not in the default or overloaded type table.")
 
 
+_sql_formatters: Dict[PythonType, Callable[[Any], str]] = {
+    type(None): lambda value: "NULL",
+    int: str,
+    float: str,
+    bool: lambda value: "1" if value else "0",
+    str: lambda value: "'" + value.replace("'", "''") + "'",
+    bytes: lambda value: "X'" + value.hex() + "'",
+}
+
+
 def _convert_sql_format(value: Any) -> str:
     """
     Given a Python value, convert to string representation
@@ -156,16 +260,10 @@ def _convert_sql_format(value: Any) -> str:
     >>> _convert_sql_format(1)
     "1"
     >>> _convert_sql_format("John Smith")
-    '"John Smith"'
-    """
-    if value is None:
-        return "NULL"
-    elif isinstance(value, str):
-        return f'"{value}"'
-    elif isinstance(value, bytes):
-        return '"' + str(value).replace("b'", "")[:-1] + '"'
-    else:
-        return str(value)
+    "'John Smith'"
+    """
+    formatter: Optional[Callable[[Any], str]] = _sql_formatters.get(type(value))
+    return formatter(value) if formatter is not None else str(value)
 
 
 def _get_table_cols(cur: sql.Cursor, table_name: str) -> List[str]:
@@ -176,8 +274,8 @@ def _get_table_cols(cur: sql.Cursor, table_name: str) -> List[str]:
     :param table_name: Name of the table.
     :return: the information about columns.
     """
-    cur.execute(f"PRAGMA table_info({table_name});")
-    return [row_info[1] for row_info in cur.fetchall()]
+    cur.execute("SELECT name FROM pragma_table_info(?);", (table_name,))
+    return [row[0] for row in cur]
 
 
 def _get_default(default_object: object, type_overload: TypesTable) -> str:
@@ -203,43 +301,206 @@ def _get_table_name(obj_or_class: Union[type, object]) -> str:
 
 
 # noinspection PyDefaultArgument
-def _get_primary_key(class_: type,
-                     type_overload: TypesTable = type_table) -> List[SQLField]:
+def _make_primary_key(class_: type,
+                      type_overload: TypesTable = type_table) -> Tuple[SQLField, ...]:
     class_: DecoratedClass = class_
-    fields: List[dataclasses.Field] = list(dataclasses.fields(class_))
-    fields = list(filter(lambda f: f.type in primary_types, fields))
-    typed_fields = list(map(lambda f: SQLField(f.name, f.type, type_overload[f.type]), fields))
-    return typed_fields or [SQLField("__id__", int, type_overload[int])]
+    typed_fields: Tuple[SQLField, ...] = tuple(
+        SQLField(f.name, f.type, type_overload[f.type], type_attributes[f.type])
+        for f in dataclasses.fields(class_) if f.type in primary_types
+    )
+    return typed_fields or (SQLField("__id__", int, type_overload[int]),)
+
 
+def _get_primary_key(class_: type) -> Tuple[SQLField, ...]:
+    return _get_schema(class_).primary
 
-def _get_key_condition(class_: type, key: Key) -> str:
+
+def _get_key_condition(class_: type, key: Key) -> Tuple[str, Key]:
+    """
+    Get the WHERE condition matching a record by its primary key
+    together with the values to bind to it.
+
+    :param class_: Decorated class.
+    :param key: Key of the record.
+    :return: A tuple of (condition, key values).
+    """
     key = _validate_key(class_, key)
-    # TODO: this is wrong, use placeholders and values instead
-    key_value = [
-        f"{k.name}={_convert_sql_format(v)}"
-        for k, v in zip(_get_primary_key(class_, type_table), key)
-    ]
-    return " AND ".join(key_value)
+    return _get_schema(class_).where_sql, key
 
 
-def _get_instance_key_condition(self) -> str:
-    class_: type = type(self)
-    _assert_is_decorated(class_)
-    key_fields = _get_primary_key(class_)
-    key_values = tuple([getattr(self, f.name) for f in key_fields])
-    return _get_key_condition(class_, key_values)
+def _get_key_getter(class_: type) -> Callable[[Any], Tuple[Any, ...]]:
+    return _get_schema(class_).key_getter
+
+
+def _get_fields(class_: type) -> Tuple[SQLField, ...]:
+    return _get_schema(class_).fields
+
+
+def _get_field_names(class_: type) -> Tuple[str, ...]:
+    return _get_schema(class_).field_names
+
+
+def _get_primary_key_names(class_: type) -> Tuple[str, ...]:
+    return _get_schema(class_).primary_names
+
+
+def _make_getter(names: Tuple[str, ...],
+                 encoders: Optional[Encoders] = None) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Build a function that reads the given attributes from an object
+    and returns their values as a tuple.
+
+    The function is generated with the attribute reads inlined,
+    e.g. ``lambda obj: (obj.a, obj.b)``.
+
+    :param names: Names of the attributes to read.
+    :param encoders: Functions to apply to the values of some of the attributes.
+    :return: The getter function.
+    """
+    encoders = encoders or {}
+    namespace: Dict[str, Any] = {}
+    values: List[str] = []
+    for i, name in enumerate(names):
+        value: str = f"obj.{name}"
+        if name in encoders:
+            namespace[f"_encode_{i}"] = encoders[name]
+            value = f"_encode_{i}({value})"
+        values.append(value)
+    result: str = f"({', '.join(values)},)" if values else "()"
+    source: str = f"def _getter(obj):\n    return {result}\n"
+    exec(source, namespace)
+    return namespace["_getter"]
+
+
+def _make_row_encoder(names: Tuple[str, ...],
+                      encoders: Optional[Encoders] = None,
+                      extra: Tuple[Any, ...] = ()) -> Callable[[Tuple[Any, ...]], Tuple[Any, ...]]:
+    """
+    Build a function that turns a row holding one value per name into a tuple
+    of parameters, applying the encoders and appending the values in ``extra``.
+    Rows with the wrong number of values raise a ValueError.
+
+    :param names: Names of the values in the rows.
+    :param encoders: Functions to apply to the values of some of the names.
+    :param extra: Values appended to every row.
+    :return: The encoder function.
+    """
+    encoders = encoders or {}
+    namespace: Dict[str, Any] = {"_extra": tuple(extra)}
+    variables: List[str] = [f"v{i}" for i in range(len(names))]
+    values: List[str] = []
+    for i, name in enumerate(names):
+        value: str = variables[i]
+        if name in encoders:
+            namespace[f"_encode_{i}"] = encoders[name]
+            value = f"_encode_{i}({value})"
+        values.append(value)
+    if not values:
+        result: str = "_extra"
+    else:
+        result: str = f"({', '.join(values)},)" + (" + _extra" if extra else "")
+    # unpacking into a list target also rejects non-empty rows when there are no names
+    source: str = f"def _encoder(row):\n" \
+                  f"    [{', '.join(variables)}] = row\n" \
+                  f"    return {result}\n"
+    exec(source, namespace)
+    return namespace["_encoder"]
 
 
 # noinspection PyDefaultArgument
-def _get_fields(class_: type,
-                type_overload: TypesTable = type_table) -> List[SQLField]:
+def _make_columns_ddl(class_: type,
+                      fields: Tuple[SQLField, ...],
+                      primary_fields: Tuple[SQLField, ...],
+                      type_overload: TypesTable = type_table) -> Tuple[str, ...]:
+    """
+    Build the definitions of the columns and of the primary key
+    of the table bound to a dataclass.
+
+    :param class_: A dataclass.
+    :param fields: The fields of the dataclass.
+    :param primary_fields: The fields of the dataclass that form the primary key.
+    :param type_overload: Overload the Python -> SQLDatatype table
+    with a custom table, this is that custom table.
+    :return: The definitions, one per column plus the primary key if needed.
+    """
+    defaults: Dict[str, Any] = {f.name: f.default for f in dataclasses.fields(class_)}
+    # declared fields
+    columns: Dict[str, str] = {
+        field.name: f"{field.ddl}{_get_default(defaults[field.name], type_overload)}"
+        for field in fields
+    }
+    # add primary key fields
+    default_key = len(primary_fields) == 1 and primary_fields[0].name == "__id__"
+    if default_key:
+        # default key
+        columns["__id__"] = f"__id__ INTEGER PRIMARY KEY AUTOINCREMENT"
+        return tuple(columns.values())
+    sql_primary_fields: str = ', '.join(f.name for f in primary_fields)
+    return tuple(columns.values()) + (f"PRIMARY KEY ({sql_primary_fields})",)
+
+
+def _schema_info(class_: type) -> SchemaInfo:
+    """
+    Describe the fields, the table and the SQL statements of a decorated class,
+    using its current table name and type table.
+
+    :param class_: Decorated class.
+    :return: The description of the class.
+    """
+    class_: DecoratedClass = class_
+    table_name: str = class_.table_name
+    types_table: TypesTable = class_.types_table
+    encoders: Optional[Encoders] = getattr(class_, "__datalite_encoders__", None)
+    # fields
+    fields: Tuple[SQLField, ...] = tuple(
+        SQLField.from_dataclass_field(f, types_table) for f in dataclasses.fields(class_)
+    )
+    field_names: Tuple[str, ...] = tuple(f.name for f in fields)
+    primary: Tuple[SQLField, ...] = _make_primary_key(class_, types_table)
+    primary_names: Tuple[str, ...] = tuple(f.name for f in primary)
+    default_key: bool = primary_names == ("__id__",)
+    # SQL statements
+    columns: str = ', '.join(field_names)
+    placeholders: str = ', '.join(["?"] * len(field_names))
+    assignments: str = ', '.join(f"{name} = ?" for name in field_names)
+    where: str = " AND ".join(f"{name} = ?" for name in primary_names)
+    return SchemaInfo(
+        table_name=table_name,
+        types_table=types_table,
+        fields=fields,
+        field_names=field_names,
+        primary=primary,
+        primary_names=primary_names,
+        getter=_make_getter(field_names, encoders),
+        # raw rows leave out the id assigned by the database
+        row_encoder=_make_row_encoder(field_names[:-1], encoders, (None,)) if default_key
+        else _make_row_encoder(field_names, encoders),
+        key_getter=_make_getter(primary_names),
+        columns_ddl=_make_columns_ddl(class_, fields, primary, types_table),
+        where_sql=where,
+        insert_sql=f"INSERT INTO {table_name}({columns}) VALUES ({placeholders});",
+        update_sql=f"UPDATE {table_name} SET {assignments} WHERE {where};",
+        delete_sql=f"DELETE FROM {table_name} WHERE {where};",
+        select_sql=f"SELECT * FROM {table_name} WHERE {where};",
+    )
+
+
+def _get_schema(class_: type) -> SchemaInfo:
+    """
+    Get the description of a decorated class. The description is stored
+    on the class and only built again if the table name or the type table changes.
+
+    :param class_: Decorated class.
+    :return: The description of the class.
+    """
     _assert_is_decorated(class_)
     class_: DecoratedClass = class_
-    fields: List[dataclasses.Field] = list(dataclasses.fields(class_))
-    fields: List[SQLField] = [
-        SQLField.from_dataclass_field(f, type_overload) for f in fields
-    ]
-    return fields
+    schema: Optional[SchemaInfo] = getattr(class_, "__datalite_schema__", None)
+    if schema is None or schema.table_name != class_.table_name \
+            or schema.types_table is not class_.types_table:
+        schema = _schema_info(class_)
+        setattr(class_, "__datalite_schema__", schema)
+    return schema
 
 
 def _get_parameters(class_: DecoratedClass) -> DataLiteClassParameters:
@@ -247,23 +508,144 @@ def _get_parameters(class_: DecoratedClass) -> DataLiteClassParameters:
     return getattr(class_, "__datalite_params__")
 
 
+# connections opened by datalite, one per database path and thread
+class _ThreadConnections:
+    """
+    The connections opened by datalite in one thread, indexed by database path.
+    """
+    __slots__ = ("connections", "__weakref__")
+
+    def __init__(self):
+        self.connections: Dict[str, Connection] = {}
+
+
+_connections = threading.local()
+# the connections of every thread, an entry goes away together with its thread
+_all_connections: "weakref.WeakSet[_ThreadConnections]" = weakref.WeakSet()
+_all_connections_lock = threading.Lock()
+
+# settings applied to the connections opened by datalite
+_file_pragmas: Tuple[str, ...] = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "temp_store = MEMORY",
+    "cache_size = -65536",
+    "busy_timeout = 5000",
+    "foreign_keys = ON",
+)
+# in-memory databases do not support WAL and have nothing to sync
+_memory_pragmas: Tuple[str, ...] = (
+    "synchronous = OFF",
+    "temp_store = MEMORY",
+)
+
+
+def _configure_connection(connection: Connection, db: str) -> None:
+    """
+    Tune a connection opened by datalite for throughput.
+
+    :param connection: The connection.
+    :param db: Path of the database.
+    :return: None.
+    """
+    pragmas = _memory_pragmas if db == ":memory:" else _file_pragmas
+    for pragma in pragmas:
+        connection.execute(f"PRAGMA {pragma};")
+
+
+def _get_connection(db: str) -> Connection:
+    """
+    Get the connection to the database at the given path, the connection
+    is opened on first use and reused by all the following calls made
+    from the same thread.
+
+    :param db: Path of the database.
+    :return: The connection.
+    """
+    thread_connections: Optional[_ThreadConnections] = getattr(_connections, "connections", None)
+    if thread_connections is None:
+        thread_connections = _connections.connections = _ThreadConnections()
+        with _all_connections_lock:
+            _all_connections.add(thread_connections)
+    connections: Dict[str, Connection] = thread_connections.connections
+    connection: Optional[Connection] = connections.get(db)
+    if connection is None:
+        connection = sql.connect(db, isolation_level=None, check_same_thread=False,
+                                 cached_statements=256)
+        _configure_connection(connection, db)
+        connections[db] = connection
+    return connection
+
+
+def close_connections() -> None:
+    """
+    Close the connections opened by datalite, in every thread. A connection
+    is opened again the next time it is needed. Called on interpreter exit.
+
+    :return: None.
+    """
+    with _all_connections_lock:
+        thread_connections: List[_ThreadConnections] = list(_all_connections)
+    for connections in (t.connections for t in thread_connections):
+        while connections:
+            try:
+                _, connection = connections.popitem()
+            except KeyError:
+                break
+            connection.close()
+
+
+atexit.register(close_connections)
+
+
 @contextmanager
 def connect(class_: type):
     _assert_is_decorated(class_)
     class_: DecoratedClass = class_
 
-    # TODO: use a lock here to modify the class
-    close: bool = False
-    if class_.connection is None and isinstance(class_.db, str):
-        class_.connection = Connection(class_.db)
-        close = True
+    # connections given by the user are used as they are
+    if class_.connection is not None:
+        yield class_.connection
+        return
 
+    connection: Connection = _get_connection(class_.db)
     try:
-        yield class_.connection
-    finally:
-        if close:
-            class_.connection.close()
-            class_.connection = None
+        yield connection
+    except BaseException:
+        if connection.in_transaction:
+            connection.rollback()
+        raise
+    if connection.in_transaction:
+        connection.commit()
+
+
+@contextmanager
+def _transaction(connection: Connection):
+    """
+    Run a block of statements atomically. If no transaction is open, one is
+    started, taking the write lock right away, and committed at the end.
+    Otherwise the block runs in a savepoint of the open transaction, so that
+    a failure only undoes the writes of the block and the transaction is left open.
+
+    :param connection: Open SQLite3 connection.
+    """
+    if connection.in_transaction:
+        connection.execute("SAVEPOINT datalite;")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK TO datalite;")
+            connection.execute("RELEASE datalite;")
+            raise
+        connection.execute("RELEASE datalite;")
+        return
+    connection.execute("BEGIN IMMEDIATE;")
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
 
 
 def _assert_is_decorated(class_: Union[type, type]):
@@ -274,11 +656,9 @@ def _assert_is_decorated(class_: Union[type, type]):
 
 
 # noinspection PyDefaultArgument
-def _validate_key(class_: type,
-                  key: Key,
-                  type_overload: TypesTable = type_table) -> Key:
+def _validate_key(class_: type, key: Key) -> Key:
     # get description of primary key for the class
-    primary_key = _get_primary_key(class_, type_overload)
+    primary_key = _get_primary_key(class_)
     # make sure the key is a tuple
     if not isinstance(key, tuple):
         if len(primary_key) == 1:
@@ -286,16 +666,18 @@ def _validate_key(class_: type,
         else:
             raise ValueError(f"Key must be of type <tuple>, "
                              f"received <{type(key).__name__}> instead.")
-    # make sure the key size is correct
-    if len(key) != len(primary_key):
-        raise ValueError(f"Class <{class_.__name__}> has a key {len(primary_key)} fields long, "
-                         f"a key of {len(key)} fields was given instead.")
-    # make sure the field types are correct
-    for i in range(len(primary_key)):
-        value = key[i]
-        if type(value) not in primitive_types:
-            raise ValueError(f"Key must contain only primitive types. Value of type "
-                             f"<{type(value).__name__}> found in position {i}.")
+    # the remaining checks are skipped when running with -O
+    if __debug__:
+        # make sure the key size is correct
+        if len(key) != len(primary_key):
+            raise ValueError(f"Class <{class_.__name__}> has a key {len(primary_key)} fields "
+                             f"long, a key of {len(key)} fields was given instead.")
+        # make sure the field types are correct
+        for i in range(len(primary_key)):
+            value = key[i]
+            if type(value) not in primitive_types:
+                raise ValueError(f"Key must contain only primitive types. Value of type "
+                                 f"<{type(value).__name__}> found in position {i}.")
     # ---
     return key
 
@@ -303,40 +685,34 @@ def _validate_key(class_: type,
 # noinspection PyDefaultArgument
 def _create_table(class_: type,
                   cursor: sql.Cursor,
-                  type_overload: TypesTable = type_table) -> None:
+                  type_overload: TypesTable = type_table,
+                  database: Optional[str] = None,
+                  table_name: Optional[str] = None) -> None:
     """
     Create the table for a specific dataclass given
     :param class_: A dataclass.
     :param cursor: Current cursor instance.
     :param type_overload: Overload the Python -> SQLDatatype table
     with a custom table, this is that custom table.
+    :param database: Name of an attached database to create the table in,
+    the main database is used by default.
+    :param table_name: Name of the table, the table name of the class is used by default.
     :return: None.
     """
     _assert_is_decorated(class_)
     class_: DecoratedClass = class_
     # table name
-    table_name: str = _get_table_name(class_)
-    # get fields
-    fields: List[dataclasses.Field] = list(dataclasses.fields(class_))
-    # declared fields
-    fields: Dict[str, str] = {
-        field.name: f"{field.name} {_convert_type(field.type, type_overload)}"
-                    f"{_get_default(field.default, type_overload)}" for field in fields
-    }
-    # add primary key fields
-    primary_fields: List[SQLField] = _get_primary_key(class_, type_overload)
-    default_key = len(primary_fields) == 1 and primary_fields[0].name == "__id__"
-    if default_key:
-        # default key
-        fields["__id__"] = f"__id__ INTEGER PRIMARY KEY AUTOINCREMENT"
+    table_name: str = table_name or _get_table_name(class_)
+    # the description of the class carries the columns built with its own type table
+    if type_overload is class_.types_table:
+        columns: Tuple[str, ...] = _get_schema(class_).columns_ddl
+    else:
+        fields = tuple(SQLField.from_dataclass_field(f, type_overload)
+                       for f in dataclasses.fields(class_))
+        primary = _make_primary_key(class_, type_overload)
+        columns: Tuple[str, ...] = _make_columns_ddl(class_, fields, primary, type_overload)
     # join fields
-    sql_fields = ', '.join(fields.values())
-    primary_fields: List[str] = list(map(lambda f: f.name, primary_fields))
-    sql_primary_fields: str = ', '.join(primary_fields)
-    if not default_key:
-        sql_fields = sql_fields + f", PRIMARY KEY ({sql_primary_fields})"
-    sql_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({sql_fields});"
-    # TODO: remove
-    # print(sql_query)
-
+    table: str = f"{database}.{table_name}" if database else table_name
+    sql_query = f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)});"
+    logger.debug(sql_query)
     cursor.execute(sql_query)
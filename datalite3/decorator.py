@@ -3,13 +3,14 @@ Defines the Datalite decorator that can be used to convert a dataclass to
 a class bound to a sqlite3 database.
 """
 import sqlite3 as sql
-from dataclasses import asdict, make_dataclass
+from dataclasses import make_dataclass
 from sqlite3 import IntegrityError, Connection
-from typing import Optional, List, Union, Type, TypeVar
+from typing import Optional, Union, Type, TypeVar, Tuple
 
-from .commons import _convert_sql_format, _get_key_condition, _create_table, type_table, Key, \
-    _get_primary_key, SQLField, TypesTable, DecoratedClass, _get_fields, \
-    connect, _get_table_name, _assert_is_decorated, DataLiteClass, DataLiteClassParameters
+from .commons import _validate_key, _create_table, type_table, Key, \
+    _make_primary_key, SQLField, TypesTable, DecoratedClass, \
+    connect, _get_table_name, _assert_is_decorated, DataLiteClass, DataLiteClassParameters, \
+    _get_field_names, _get_key_getter, _get_schema, Encoders, SchemaInfo, _make_slotted
 from .constraints import ConstraintFailedError
 from .fetch import fetch_from
 
@@ -17,9 +18,7 @@ T = TypeVar("T")
 
 
 def _get_key(self) -> Key:
-    return tuple([
-        getattr(self, k.name) for k in _get_primary_key(type(self))
-    ])
+    return _get_key_getter(type(self))(self)
 
 
 def _create_entry(self) -> None:
@@ -33,18 +32,12 @@ def _create_entry(self) -> None:
     # get class
     class_: DecoratedClass = type(self)
     # ---
-    table_name: str = _get_table_name(self)
-    field_names = list(map(lambda f: f.name, _get_fields(class_)))
-    field_values = [getattr(self, f) for f in field_names]
-
-    cols = ', '.join(field_names)
-    placeholders = ', '.join(["?"] * len(field_values))
-    query = f"INSERT INTO {table_name}({cols}) VALUES ({placeholders});"
+    schema: SchemaInfo = _get_schema(class_)
 
     with connect(class_) as conn:
         cur: sql.Cursor = conn.cursor()
         try:
-            cur.execute(query, field_values)
+            cur.execute(schema.insert_sql, schema.getter(self))
             # TODO: fix this
             # TODO: we should fetch all the fields we left blank and where DEFAULTed by SQL
             self.__setattr__("__id__", cur.lastrowid)
@@ -64,13 +57,8 @@ def _update_entry(self) -> None:
     # ---
     with connect(class_) as conn:
         cur: sql.Cursor = conn.cursor()
-        table_name: str = _get_table_name(self)
-        kv_pairs = [item for item in asdict(self).items()]
-        kv_pairs.sort(key=lambda item: item[0])
-        kv = ', '.join(item[0] + ' = ' + _convert_sql_format(item[1]) for item in kv_pairs)
-        this = _get_key_condition(type(self), _get_key(self))
-        query = f"UPDATE {table_name} SET {kv} WHERE {this};"
-        cur.execute(query)
+        schema: SchemaInfo = _get_schema(class_)
+        cur.execute(schema.update_sql, schema.getter(self) + schema.key_getter(self))
         conn.commit()
 
 
@@ -84,9 +72,8 @@ def _fetch_entry(self) -> None:
     # get class
     class_: DecoratedClass = type(self)
     remote: class_ = fetch_from(class_, _get_key(self))
-    fields: List[SQLField] = _get_fields(class_)
-    for field in fields:
-        setattr(self, field.name, getattr(remote, field.name))
+    for name in _get_field_names(class_):
+        setattr(self, name, getattr(remote, name))
 
 
 def remove_all(class_: DecoratedClass):
@@ -101,12 +88,12 @@ def remove_all(class_: DecoratedClass):
 
 def remove_from(class_: DecoratedClass, key: Key):
     _assert_is_decorated(class_)
-    this = _get_key_condition(class_, key)
-    table_name: str = _get_table_name(class_)
+    key = _validate_key(class_, key)
+    query: str = _get_schema(class_).delete_sql
     # connect
     with connect(class_) as conn:
         cur: sql.Cursor = conn.cursor()
-        cur.execute(f"DELETE FROM {table_name} WHERE {this}")
+        cur.execute(query, key)
         conn.commit()
 
 
@@ -122,7 +109,9 @@ def _remove_entry(self) -> None:
 def decorate(dataclass_: DecoratedClass, db: Union[str, Connection],
              table_name: Optional[str] = None, *,
              auto_commit: bool = True,
-             type_overload: Optional[TypesTable] = None) -> Type[T]:
+             type_overload: Optional[TypesTable] = None,
+             encoders: Optional[Encoders] = None,
+             slots: bool = False) -> Type[T]:
     """Bind a dataclass to a sqlite3 database. This adds new methods to the class, such as
     `create_entry()`, `remove_entry()` and `update_entry()`.
 
@@ -131,18 +120,23 @@ def decorate(dataclass_: DecoratedClass, db: Union[str, Connection],
     :param table_name: Optional name for the table. The name of the class will be used by default.
     :param auto_commit: Enable auto-commit.
     :param type_overload: Type overload dictionary.
+    :param encoders: Dictionary mapping field names to functions used to convert the
+        value of those fields before they are written to the database.
+    :param slots: Store the fields of the instances in `__slots__` instead of a `__dict__`.
+        The instances stay weak-referenceable and zero-argument `super()` keeps working.
     :return: The new dataclass.
     """
+    encoders = encoders or {}
     params: DataLiteClassParameters = DataLiteClassParameters(
         auto_commit=auto_commit
     )
-    # update type table
-    types_table = type_table.copy()
-    if type_overload is not None:
-        types_table.update(type_overload)
+    # update type table, the default one is shared by all the classes that do not overload it
+    types_table = type_table if type_overload is None else {**type_table, **type_overload}
     # add primary key fields if not present
-    primary_fields: List[SQLField] = _get_primary_key(dataclass_, types_table)
+    primary_fields: Tuple[SQLField, ...] = _make_primary_key(dataclass_, types_table)
     default_key = len(primary_fields) == 1 and primary_fields[0].name == "__id__"
+    if slots:
+        dataclass_ = _make_slotted(dataclass_, extra=("__datalite_created__",))
     if default_key:
         # noinspection PyTypeChecker
         dataclass_ = make_dataclass(
@@ -157,6 +151,9 @@ def decorate(dataclass_: DecoratedClass, db: Union[str, Connection],
             fields=[],
             bases=(DataLiteClass, dataclass_,)
         )
+    if slots:
+        # `create_entry()` stores the row id in `__id__` even when the class has its own key
+        dataclass_ = _make_slotted(dataclass_, extra=("__id__",))
     # make table name
     table_name_: str = table_name or dataclass_.__name__.lower()
     # add the path of the database to the class
@@ -171,6 +168,13 @@ def decorate(dataclass_: DecoratedClass, db: Union[str, Connection],
     setattr(dataclass_, '__datalite_params__', params)
     # mark class as decorated
     setattr(dataclass_, '__datalite_decorated__', True)
+    # add the encoders of the fields
+    setattr(dataclass_, '__datalite_encoders__', encoders)
+    # describe the fields, the table and the SQL statements once, they are stored on the class
+    schema: SchemaInfo = _get_schema(dataclass_)
+    unknown_fields = set(encoders).difference(schema.field_names)
+    if unknown_fields:
+        raise ValueError(f"Encoders given for unknown fields {sorted(unknown_fields)}.")
     # create table
     with connect(dataclass_) as conn:
         cur: sql.Cursor = conn.cursor()
@@ -187,7 +191,9 @@ def decorate(dataclass_: DecoratedClass, db: Union[str, Connection],
 # NOTE: The return type is not correct but it keeps type hinting in PyCharm alive
 def datalite(db: Union[str, Connection], table_name: Optional[str] = None, *,
              auto_commit: bool = False,
-             type_overload: Optional[TypesTable] = None) -> Type[T]:
+             type_overload: Optional[TypesTable] = None,
+             encoders: Optional[Encoders] = None,
+             slots: bool = False) -> Type[T]:
     """Bind a dataclass to a sqlite3 database. This adds new methods to the class, such as
     `create_entry()`, `remove_entry()` and `update_entry()`.
 
@@ -195,11 +201,15 @@ def datalite(db: Union[str, Connection], table_name: Optional[str] = None, *,
     :param table_name: Optional name for the table. The name of the class will be used by default.
     :param auto_commit: Enable auto-commit.
     :param type_overload: Type overload dictionary.
+    :param encoders: Dictionary mapping field names to functions used to convert the
+        value of those fields before they are written to the database.
+    :param slots: Store the fields of the instances in `__slots__` instead of a `__dict__`.
+        The instances stay weak-referenceable and zero-argument `super()` keeps working.
     :return: The new dataclass.
     """
 
     def _wrap(dataclass_: Type[T]) -> Type[T]:
         return decorate(dataclass_, db, table_name, auto_commit=auto_commit,
-                        type_overload=type_overload)
+                        type_overload=type_overload, encoders=encoders, slots=slots)
 
     return _wrap
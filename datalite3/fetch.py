@@ -1,26 +1,53 @@
+import functools
 import sqlite3 as sql
-from typing import List, Tuple, Any
+from typing import Tuple, Any, Dict, Optional
 
-from .commons import _convert_sql_format, _get_fields, connect, \
-    _assert_is_decorated, Key, _get_key_condition, _validate_key, SQLField, _get_primary_key, \
-    DecoratedClass, _get_table_name
+from .commons import _get_field_names, connect, \
+    _assert_is_decorated, Key, _get_key_condition, _validate_key, _get_primary_key_names, \
+    DecoratedClass, _get_table_name, _get_schema, SchemaInfo
 
 
-def _insert_pagination(query: str, class_: DecoratedClass, page: int, element_count: int) -> str:
+@functools.lru_cache(maxsize=256)
+def _select_sql(table_name: str, columns: str = "*", condition: Optional[str] = None,
+                order_by: Optional[str] = None) -> str:
     """
-    Insert the pagination arguments if page number is given.
+    Build a SELECT statement, statements of the same shape are built once.
+
+    :param table_name: Name of the table to select from.
+    :param columns: Columns to select.
+    :param condition: Optional condition the records must fit.
+    :param order_by: If given, the records are sorted by these columns
+        and paginated with two parameters, LIMIT and OFFSET.
+    :return: The statement.
+    """
+    query: str = f"SELECT {columns} FROM {table_name}"
+    if condition:
+        query += f" WHERE {condition}"
+    if order_by:
+        query += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+    return query + ";"
+
+
+def _paginated_select(class_: DecoratedClass, page: int, element_count: int,
+                      columns: str = "*", condition: Optional[str] = None,
+                      params: tuple = ()) -> Tuple[str, tuple]:
+    """
+    Build the SELECT statement for a page of records and its parameters.
 
-    :param query: Query to insert to
     :param class_: Decorated class
-    :param page: Page to get.
+    :param page: Page to get, 0 means all the records.
     :param element_count: Element count in each page.
-    :return: The modified (or not) query.
+    :param columns: Columns to select.
+    :param condition: Optional condition the records must fit.
+    :param params: Parameters of the condition.
+    :return: A tuple of (statement, parameters).
     """
-    if page:
-        key: List[SQLField] = _get_primary_key(class_)
-        fields: str = ", ".join(map(lambda f: f.name, key))
-        query += f" ORDER BY {fields} LIMIT {element_count} OFFSET {(page - 1) * element_count}"
-    return query + ";"
+    table_name: str = _get_table_name(class_)
+    if not page:
+        return _select_sql(table_name, columns, condition), params
+    order_by: str = ", ".join(_get_primary_key_names(class_))
+    query: str = _select_sql(table_name, columns, condition, order_by)
+    return query, params + (element_count, (page - 1) * element_count)
 
 
 def is_fetchable(class_: type, key: Key) -> bool:
@@ -33,13 +60,12 @@ def is_fetchable(class_: type, key: Key) -> bool:
     :return: If the object is fetchable.
     """
     _assert_is_decorated(class_)
-    key = _validate_key(class_, key)
-    condition: str = _get_key_condition(class_, key)
+    condition, key = _get_key_condition(class_, key)
     table_name: str = _get_table_name(class_)
     with connect(class_) as con:
         cur: sql.Cursor = con.cursor()
         try:
-            cur.execute(f"SELECT 1 FROM {table_name} WHERE {condition};")
+            cur.execute(_select_sql(table_name, "1", condition), key)
         except sql.OperationalError:
             raise KeyError(f"Table {table_name} does not exist.")
     return bool(cur.fetchall())
@@ -55,12 +81,12 @@ def fetch_equals(class_: type, field: str, value: Any, ) -> Any:
     :return: The object whose data is taken from the database.
     """
     _assert_is_decorated(class_)
-    field_names = list(map(lambda f: f.name, _get_fields(class_)))
-    table_name = _get_table_name(class_)
+    field_names = _get_field_names(class_)
+    query: str = _select_sql(_get_table_name(class_), condition=f"{field} = ?")
     with connect(class_) as con:
         cur: sql.Cursor = con.cursor()
-        cur.execute(f"SELECT * FROM {table_name} WHERE {field} = {_convert_sql_format(value)};")
-        field_values = list(cur.fetchone())
+        cur.execute(query, (value,))
+        field_values = cur.fetchone()
     kwargs = dict(zip(field_names, field_values))
     obj = class_(**kwargs, __commit__=False)
     return obj
@@ -75,11 +101,19 @@ def fetch_from(class_: type, key: Key) -> Any:
     :return: The fetched object.
     """
     _assert_is_decorated(class_)
-    condition: str = _get_key_condition(class_, key)
-    if not is_fetchable(class_, key):
+    key = _validate_key(class_, key)
+    schema: SchemaInfo = _get_schema(class_)
+    with connect(class_) as con:
+        cur: sql.Cursor = con.cursor()
+        try:
+            cur.execute(schema.select_sql, key)
+        except sql.OperationalError:
+            raise KeyError(f"Table {schema.table_name} does not exist.")
+        record = cur.fetchone()
+    if record is None:
         raise KeyError(f"An object with key {key} of type {class_.__name__} does not exist, or"
                        f"otherwise is unreachable.")
-    return fetch_if(class_, condition)[0]
+    return _convert_record_to_object(class_, record)
 
 
 def _convert_record_to_object(class_: type, record: Tuple[Any]) -> Any:
@@ -91,7 +125,7 @@ def _convert_record_to_object(class_: type, record: Tuple[Any]) -> Any:
     :return: the created object.
     """
     _assert_is_decorated(class_)
-    field_names = list(map(lambda f: f.name, _get_fields(class_)))
+    field_names = _get_field_names(class_)
     kwargs = dict(zip(field_names, record))
     obj = class_(**kwargs, __commit__=False)
     return obj
@@ -109,12 +143,29 @@ def fetch_if(class_: type, condition: str, page: int = 0, element_count: int = 1
     :return: A tuple of records that fit the given condition
         of given type class_.
     """
+    return _fetch_if(class_, condition, (), page, element_count)
+
+
+def _fetch_if(class_: type, condition: str, params: tuple, page: int = 0,
+              element_count: int = 10) -> tuple:
+    """
+    Fetch all class_ type variables from the bound db,
+    provided they fit the given parametrized condition.
+
+    :param class_: Class type to fetch.
+    :param condition: Condition to check for, with ? placeholders.
+    :param params: Values bound to the placeholders of the condition.
+    :param page: Which page to retrieve, default all. (0 means closed).
+    :param element_count: Element count in each page.
+    :return: A tuple of records that fit the given condition
+        of given type class_.
+    """
     _assert_is_decorated(class_)
-    table_name = _get_table_name(class_)
+    query, params = _paginated_select(class_, page, element_count,
+                                      condition=condition, params=params)
     with connect(class_) as con:
         cur: sql.Cursor = con.cursor()
-        query: str = f"SELECT * FROM {table_name} WHERE {condition}"
-        cur.execute(_insert_pagination(query, class_, page, element_count))
+        cur.execute(query, params)
         records: list = cur.fetchall()
     return tuple(_convert_record_to_object(class_, record) for record in records)
 
@@ -133,7 +184,7 @@ def fetch_where(class_: type, field: str, value: Any, page: int = 0,
     :param element_count: Element count in each page.
     :return: A tuple of the records.
     """
-    return fetch_if(class_, f"{field} = {_convert_sql_format(value)}", page, element_count)
+    return _fetch_if(class_, f"{field} = ?", (value,), page, element_count)
 
 
 def fetch_all(class_: type, page: int = 0, element_count: int = 10) -> tuple:
@@ -148,12 +199,39 @@ def fetch_all(class_: type, page: int = 0, element_count: int = 10) -> tuple:
     """
     _assert_is_decorated(class_)
     table_name: str = _get_table_name(class_)
+    query, params = _paginated_select(class_, page, element_count)
     with connect(class_) as con:
         cur: sql.Cursor = con.cursor()
-        query: str = f"SELECT * FROM {table_name}"
         try:
-            cur.execute(_insert_pagination(query, class_, page, element_count))
+            cur.execute(query, params)
         except sql.OperationalError:
             raise TypeError(f"No record of type {table_name}")
         records = cur.fetchall()
     return tuple(_convert_record_to_object(class_, record) for record in records)
+
+
+def fetch_all_columnar(class_: type, page: int = 0, element_count: int = 10) -> Dict[str, tuple]:
+    """
+    Fetchall the records in the bound database, column by column.
+    No object is constructed, which makes this cheaper than ``fetch_all``
+    when the values are fed to column-oriented code, e.g. ``numpy.asarray``.
+
+    :param class_: Class of the records.
+    :param page: Which page to retrieve, default all. (0 means closed).
+    :param element_count: Element count in each page.
+    :return: A dictionary mapping the name of each field of class_
+        to the tuple of its values, one per record.
+    """
+    _assert_is_decorated(class_)
+    table_name: str = _get_table_name(class_)
+    field_names: Tuple[str, ...] = _get_field_names(class_)
+    query, params = _paginated_select(class_, page, element_count, ", ".join(field_names))
+    with connect(class_) as con:
+        cur: sql.Cursor = con.cursor()
+        try:
+            cur.execute(query, params)
+        except sql.OperationalError:
+            raise TypeError(f"No record of type {table_name}")
+        records = cur.fetchall()
+    columns = zip(*records) if records else (() for _ in field_names)
+    return dict(zip(field_names, columns))
@@ -3,16 +3,27 @@ This module includes functions to insert multiple records
 to a bound database at one time, with one time open and closing
 of the database file.
 """
+import functools
 import sqlite3 as sql
-from typing import TypeVar, Union, List, Tuple
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import TypeVar, Union, List, Tuple, Iterator, Iterable, Any, Sequence
 
-from dataclasses import asdict
-
-from .commons import _convert_sql_format, _get_table_name, connect, _get_fields
+from .commons import connect, _get_schema, SchemaInfo, _assert_is_decorated, DecoratedClass, \
+    _create_table, _transaction
 from .constraints import ConstraintFailedError
 
 T = TypeVar('T')
 
+# default number of records inserted per executemany() call
+DEFAULT_BATCH_SIZE = 10_000
+
+# name under which the destination database of a copy is attached
+COPY_DATABASE = "datalite_copy"
+
+# SQLite builds older than 3.32 bind at most 999 parameters per statement
+MAX_VARIABLE_NUMBER = 999
+
 
 class HeterogeneousCollectionError(Exception):
     """
@@ -31,56 +42,353 @@ def _check_homogeneity(objects: Union[List[T], Tuple[T]]) -> None:
     :param objects: Tuple or list to check.
     :return: If all of the members of the same type.
     """
-    first = objects[0]
-    class_ = first.__class__
-    if not all([isinstance(obj, class_) or isinstance(first, obj.__class__) for obj in objects]):
+    class_ = type(objects[0])
+    if not all(type(obj) is class_ for obj in objects):
         raise HeterogeneousCollectionError("Tuple or List is not homogeneous.")
 
 
-def _mass_insert(objects: Union[List[T], Tuple[T]]) -> None:
+def _iter_homogeneous(objects: Iterable[T]) -> Tuple[type, Iterator[T]]:
+    """
+    Get the type of the first member of a collection, and an iterator
+    over the members that checks that they all are of that type.
+
+    :param objects: Collection to iterate over, any iterable.
+    :return: A tuple of (type, iterator). The iterator raises
+        HeterogeneousCollectionError when it reaches a member of another type.
+    """
+    iterator: Iterator[T] = iter(objects)
+    for first in iterator:
+        break
+    else:
+        raise ValueError("Collection is empty.")
+    class_ = type(first)
+
+    def _members() -> Iterator[T]:
+        yield first
+        for obj in iterator:
+            if type(obj) is not class_:
+                raise HeterogeneousCollectionError("Collection is not homogeneous.")
+            yield obj
+
+    return class_, _members()
+
+
+# settings trading durability for speed, used when memory protection is off
+_UNPROTECTED_PRAGMAS: Tuple[Tuple[str, str], ...] = (
+    ("synchronous", "OFF"),
+    ("journal_mode", "MEMORY"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-65536"),
+)
+
+
+@contextmanager
+def _memory_protection(con: sql.Connection, protect_memory: bool, database: str = "main"):
+    """
+    Given an sqlite3 connection, if memory protection is false,
+    trade durability for speed: disable the syncing of writes to disk and
+    keep the journal, temporary tables and a large page cache in memory.
+    The previous settings of the connection are restored on exit.
+
+    :param con: Open SQLite3 connection.
+    :param protect_memory: Whether or not should memory be protected.
+    :param database: Name of the database the settings are applied to.
+    """
+    if protect_memory:
+        yield
+        return
+    # the journal mode cannot be changed inside a transaction
+    pragmas = tuple((name, value) for name, value in _UNPROTECTED_PRAGMAS
+                    if name != "journal_mode" or not con.in_transaction)
+    previous = tuple((name, con.execute(f"PRAGMA {database}.{name};").fetchone()[0])
+                     for name, _ in pragmas)
+    try:
+        for name, value in pragmas:
+            con.execute(f"PRAGMA {database}.{name} = {value};")
+        yield
+    finally:
+        for name, value in previous:
+            con.execute(f"PRAGMA {database}.{name} = {value};")
+
+
+@functools.lru_cache(maxsize=256)
+def _multi_insert_sql(insert_sql: str, num_rows: int) -> str:
+    """
+    Turn a single-row INSERT statement into one inserting several rows,
+    i.e. ``INSERT INTO t(a, b) VALUES (?, ?), (?, ?), ...;``.
+
+    :param insert_sql: INSERT statement with a single VALUES group.
+    :param num_rows: Number of rows inserted by the new statement.
+    :return: The new statement.
+    """
+    head, values = insert_sql.rstrip(";").split(" VALUES ", 1)
+    return f"{head} VALUES {', '.join([values] * num_rows)};"
+
+
+def _execute_multi_insert(cur: sql.Cursor, insert_sql: str, batch: List[tuple],
+                          rows_per_statement: int) -> None:
+    """
+    Insert a batch of rows binding several rows to each statement.
+
+    :param cur: Cursor to an open SQLite3 connection.
+    :param insert_sql: INSERT statement with a single VALUES group.
+    :param batch: Rows to insert.
+    :param rows_per_statement: Maximum number of rows inserted by a single statement.
+    :return: None.
+    """
+    full: int = len(batch) - len(batch) % rows_per_statement
+    if full:
+        cur.executemany(
+            _multi_insert_sql(insert_sql, rows_per_statement),
+            (tuple(chain.from_iterable(batch[i:i + rows_per_statement]))
+             for i in range(0, full, rows_per_statement))
+        )
+    if full < len(batch):
+        rest: List[tuple] = batch[full:]
+        cur.execute(_multi_insert_sql(insert_sql, len(rest)), tuple(chain.from_iterable(rest)))
+
+
+def _get_rows_per_statement(schema: SchemaInfo, batch_size: int) -> int:
+    """
+    Get the number of rows inserted by a single INSERT statement, narrow rows
+    are inserted many at a time, as long as their parameters fit in one statement.
+
+    :param schema: Description of the class of the rows.
+    :param batch_size: Number of rows bound per batch.
+    :return: The number of rows.
+    """
+    return min(MAX_VARIABLE_NUMBER // len(schema.field_names), batch_size)
+
+
+def _mass_execute(class_: type, query: str, rows: Iterator[tuple], protect_memory: bool = True,
+                  batch_size: int = DEFAULT_BATCH_SIZE, rows_per_statement: int = 1,
+                  database: str = "main") -> None:
+    """
+    Execute a statement once per row in a single transaction.
+
+    :param class_: Decorated class the rows belong to.
+    :param query: Parametrized statement to execute.
+    :param rows: Parameters of the statement, one tuple per execution.
+    :param protect_memory: Whether or not memory
+        protections are on or off.
+    :param batch_size: Number of rows bound per batch.
+    :param rows_per_statement: If greater than one, ``query`` must be a single-row
+        INSERT statement, the rows are inserted this many at a time.
+    :param database: Name of the database written to, memory protection applies to it.
+    :return: None
+    """
+    with connect(class_) as con, _memory_protection(con, protect_memory, database):
+        cur: sql.Cursor = con.cursor()
+        # run all the statements in a single transaction
+        try:
+            with _transaction(con):
+                batch = list(islice(rows, batch_size))
+                while batch:
+                    if rows_per_statement > 1:
+                        _execute_multi_insert(cur, query, batch, rows_per_statement)
+                    else:
+                        cur.executemany(query, batch)
+                    batch = list(islice(rows, batch_size))
+        except sql.IntegrityError:
+            raise ConstraintFailedError
+
+
+@functools.lru_cache(maxsize=256)
+def _copy_sql(table_name: str, field_names: Tuple[str, ...], select: bool = False) -> str:
+    """
+    Build the statement inserting records into the table of the attached database.
+
+    :param table_name: Name of the table.
+    :param field_names: Names of the columns of the table.
+    :param select: Whether the values are selected from the table of the main database,
+        rather than bound as parameters.
+    :return: The statement.
+    """
+    columns: str = ', '.join(field_names)
+    if select:
+        values: str = f"SELECT {columns} FROM main.{table_name}"
+    else:
+        values: str = f"VALUES ({', '.join(['?'] * len(field_names))})"
+    return f"INSERT INTO {COPY_DATABASE}.{table_name}({columns}) {values};"
+
+
+@contextmanager
+def _attach(class_: DecoratedClass, db_path: str):
+    """
+    Attach a database to the connection of a class, as ``COPY_DATABASE``,
+    and make sure the table of the class exists in it.
+
+    :param class_: Decorated class.
+    :param db_path: Path of the database to attach.
+    :return: The connection, with the database attached.
+    """
+    with connect(class_) as con:
+        # a database cannot be attached nor detached inside a transaction
+        if con.in_transaction:
+            raise sql.OperationalError("Records cannot be copied to another database "
+                                       "while a transaction is open on the connection.")
+        cur: sql.Cursor = con.cursor()
+        cur.execute(f"ATTACH DATABASE ? AS {COPY_DATABASE};", (db_path,))
+        try:
+            _create_table(class_, cur, type_overload=class_.types_table, database=COPY_DATABASE)
+            yield con
+        finally:
+            cur.execute(f"DETACH DATABASE {COPY_DATABASE};")
+
+
+def _mass_insert(objects: Iterable[T], protect_memory: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
     """
     Insert multiple records into an SQLite3 database.
 
     :param objects: Objects to insert.
+    :param protect_memory: Whether or not memory
         protections are on or off.
+    :param batch_size: Number of records inserted per batch.
+    :return: None
+    """
+    class_, objects = _iter_homogeneous(objects)
+    schema: SchemaInfo = _get_schema(class_)
+    # rows are built lazily, one batch at a time, a heterogeneous
+    # collection rolls back the records inserted up to that point
+    rows = map(schema.getter, objects)
+    rows_per_statement: int = _get_rows_per_statement(schema, batch_size)
+    _mass_execute(class_, schema.insert_sql, rows, protect_memory, batch_size, rows_per_statement)
+
+
+def _mass_remove(objects: Union[List[T], Tuple[T]], protect_memory: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Remove multiple records from an SQLite3 database.
+
+    :param objects: Objects to remove.
+    :param protect_memory: Whether or not memory
+        protections are on or off.
+    :param batch_size: Number of records removed per batch.
     :return: None
     """
     _check_homogeneity(objects)
     class_ = type(objects[0])
-    sql_parts = []
-    sql_values = []
-    table_name = _get_table_name(class_)
-    field_names = list(map(lambda f: f.name, _get_fields(class_)))
+    schema: SchemaInfo = _get_schema(class_)
+    keys = map(schema.key_getter, objects)
+    _mass_execute(class_, schema.delete_sql, keys, protect_memory, batch_size)
 
-    for i, obj in enumerate(objects):
-        values: dict = asdict(obj)
-        placeholders: str = ', '.join(["?"] * len(values))
-        sql_parts.append(f"({placeholders})")
-        sql_values.extend(values[k] for k in field_names)
 
-    columns: str = ', '.join(field_names)
-    values_list: str = ', '.join(sql_parts)
-    sql_insert = f"INSERT INTO {table_name}({columns}) VALUES {values_list};"
+def create_many(objects: Iterable[T], protect_memory: bool = True,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Insert many records corresponding to objects
+    in a collection, in a single transaction.
 
-    with connect(class_) as con:
-        cur: sql.Cursor = con.cursor()
+    :param objects: Any iterable of objects decorated with datalite, all of the same
+        type, e.g. a list or a generator. It is consumed one batch at a time.
+    :param protect_memory: If False, the connection is configured to not sync
+        writes to disk and to keep its journal in memory, a database
+        corruption is possible in case of a crash during the call. The previous
+        settings of the connection are restored afterwards.
+    :param batch_size: Number of records inserted per batch, all the batches are inserted
+        in a single transaction. Only the rows of one batch are kept in memory at once,
+        throughput stops improving past a few thousand records per batch.
+    :return: None.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive number.")
+    _mass_insert(objects, protect_memory, batch_size)
+
+
+def create_many_raw(class_: DecoratedClass, rows: Iterable[Sequence[Any]],
+                    protect_memory: bool = True, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Insert many records given as rows of values rather than objects,
+    no object is constructed for the records.
+
+    :param class_: A class decorated with datalite.
+    :param rows: An iterable of tuples, each holding the values of the fields
+        of the class in the order they are declared in. The encoders of the class
+        are applied to the values. The `__id__` of classes without a primary key
+        is assigned by the database and is left out of the rows.
+    :param protect_memory: If False, the connection is configured to not sync
+        writes to disk and to keep its journal in memory, see ``create_many``.
+    :param batch_size: Number of records inserted per batch.
+    :return: None.
+    """
+    _assert_is_decorated(class_)
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive number.")
+    schema: SchemaInfo = _get_schema(class_)
+    rows = map(schema.row_encoder, rows)
+    rows_per_statement: int = _get_rows_per_statement(schema, batch_size)
+    _mass_execute(class_, schema.insert_sql, rows, protect_memory, batch_size, rows_per_statement)
+
+
+def copy_many(objects: Union[List[T], Tuple[T]], db_path: str, protect_memory: bool = True,
+              batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Insert the records corresponding to objects in a tuple or a list
+    into another database, in a single transaction. The table is created
+    in the other database if it does not exist.
+
+    :param objects: A tuple or a list of objects decorated
+        with datalite.
+    :param db_path: Path of the database to copy the records to.
+    :param protect_memory: If False, the other database is configured to not sync
+        writes to disk and to keep its journal in memory, see ``create_many``.
+    :param batch_size: Number of records inserted per batch.
+    :return: None.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive number.")
+    if not objects:
+        raise ValueError("Collection is empty.")
+    _check_homogeneity(objects)
+    class_ = type(objects[0])
+    schema: SchemaInfo = _get_schema(class_)
+    query: str = _copy_sql(schema.table_name, schema.field_names)
+    rows = map(schema.getter, objects)
+    rows_per_statement: int = _get_rows_per_statement(schema, batch_size)
+    # the records are written through the connection of the class
+    with _attach(class_, db_path):
+        _mass_execute(class_, query, rows, protect_memory, batch_size, rows_per_statement,
+                      COPY_DATABASE)
+
+
+def copy_all(class_: DecoratedClass, db_path: str) -> None:
+    """
+    Copy all the records of a class into another database, in a single transaction.
+    The table is created in the other database if it does not exist. The records
+    are copied by SQLite, they are not read into Python.
+
+    :param class_: A class decorated with datalite.
+    :param db_path: Path of the database to copy the records to.
+    :return: None.
+    """
+    _assert_is_decorated(class_)
+    schema: SchemaInfo = _get_schema(class_)
+    query: str = _copy_sql(schema.table_name, schema.field_names, select=True)
+    with _attach(class_, db_path) as con:
         try:
-            cur.execute(sql_insert, sql_values)
+            with _transaction(con):
+                con.execute(query)
         except sql.IntegrityError:
             raise ConstraintFailedError
-        con.commit()
 
 
-def create_many(objects: Union[List[T], Tuple[T]]) -> None:
+def remove_many(objects: Union[List[T], Tuple[T]], protect_memory: bool = True,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> None:
     """
-    Insert many records corresponding to objects
-    in a tuple or a list.
+    Remove the records corresponding to objects
+    in a tuple or a list, in a single transaction.
 
     :param objects: A tuple or a list of objects decorated
         with datalite.
+    :param protect_memory: If False, the connection is configured to not sync
+        writes to disk and to keep its journal in memory, see ``create_many``.
+    :param batch_size: Number of records removed per batch.
     :return: None.
     """
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive number.")
     if objects:
-        _mass_insert(objects)
+        _mass_remove(objects, protect_memory, batch_size)
     else:
         raise ValueError("Collection is empty.")
@@ -6,9 +6,7 @@ import sqlite3 as sql
 from typing import Dict, Tuple, List
 
 from .commons import _create_table, _get_table_cols, DecoratedClass, _assert_is_decorated, \
-    _get_table_name, connect, _get_fields, PrimitiveType
-
-_MISSING_VALUE = object()
+    _get_table_name, connect, _get_field_names, _transaction
 
 
 def _get_class_table(class_: DecoratedClass) -> Tuple[str, List[str]]:
@@ -33,23 +31,6 @@ def _get_class_table(class_: DecoratedClass) -> Tuple[str, List[str]]:
     return table_name, columns
 
 
-def _copy_records(class_: DecoratedClass, table_name: str):
-    """
-    Copy all records from a table.
-
-    :param class_: Decorated class.
-    :param table_name: Name of the table.
-    :return: A generator holding dataclass asdict representations.
-    """
-    with connect(class_) as con:
-        cur: sql.Cursor = con.cursor()
-        cur.execute(f'SELECT * FROM {table_name};')
-        values = cur.fetchall()
-        keys = _get_table_cols(cur, table_name)
-    records = (dict(zip(keys, value)) for value in values)
-    return records
-
-
 def _drop_table(class_: DecoratedClass, table_name: str) -> None:
     """
     Drop a table.
@@ -64,61 +45,24 @@ def _drop_table(class_: DecoratedClass, table_name: str) -> None:
         con.commit()
 
 
-def _modify_records(data, col_to_del: Tuple[str], col_to_add: Tuple[str],
-                    flow: Dict[str, str]) -> List[Dict[str, PrimitiveType]]:
+def _copy_columns(cur: sql.Cursor, source: str, destination: str,
+                  column_map: Dict[str, str]) -> None:
     """
-    Modify the asdict records in accordance
-        with schema migration rules provided.
+    Copy all the records of a table into another one, inside SQLite.
 
-    :param data: Data kept as asdict in tuple.
-    :param col_to_del: Column names to delete.
-    :param col_to_add: Column names to add.
-    :param flow: A dictionary that explain
-        if the data from a deleted column
-        will be transferred to a column
-        to be added.
-    :return: The modified data records.
-    """
-    records = []
-    for record in data:
-        record_mod = {}
-        for key in record.keys():
-            if key in col_to_del and key in flow:
-                record_mod[flow[key]] = record[key]
-            elif key in col_to_del:
-                pass
-            else:
-                record_mod[key] = record[key]
-        for key_to_add in col_to_add:
-            if key_to_add not in record_mod:
-                record_mod[key_to_add] = _MISSING_VALUE
-        records.append(record_mod)
-    return records
-
-
-def _migrate_records(class_: type, data,
-                     col_to_del: Tuple[str], col_to_add: Tuple[str], flow: Dict[str, str]) -> None:
-    """
-    Migrate the records into the modified table.
-
-    :param class_: Class of the entries.
-    :param data: Data, asdict tuple.
-    :param col_to_del: Columns to be deleted.
-    :param col_to_add: Columns to be added.
-    :param flow: Flow dictionary stating where
-        column data will be transferred.
+    :param cur: Cursor to an open SQLite3 connection.
+    :param source: Name of the table to copy from.
+    :param destination: Name of the table to copy to.
+    :param column_map: A dictionary mapping the columns of the destination
+        table to the columns of the source table they are copied from.
     :return: None.
     """
-    with connect(class_) as con:
-        cur: sql.Cursor = con.cursor()
-        _create_table(class_, cur, type_overload=getattr(class_, 'types_table'))
-        con.commit()
-    new_records = _modify_records(data, col_to_del, col_to_add, flow)
-    for record in new_records:
-        keys_to_delete = [k for k in record if record[k] is _MISSING_VALUE]
-        for key in keys_to_delete:
-            del record[key]
-        class_(**record).create_entry()
+    if not column_map:
+        return
+    destination_cols: str = ', '.join(column_map.keys())
+    source_cols: str = ', '.join(column_map.values())
+    cur.execute(f"INSERT INTO {destination}({destination_cols}) "
+                f"SELECT {source_cols} FROM {source};")
 
 
 def basic_migrate(class_: DecoratedClass, column_transfer: dict = None) -> None:
@@ -135,10 +79,37 @@ def basic_migrate(class_: DecoratedClass, column_transfer: dict = None) -> None:
     :return: None.
     """
     _assert_is_decorated(class_)
-    field_names: List[str] = list(map(lambda f: f.name, _get_fields(class_)))
+    field_names: Tuple[str, ...] = _get_field_names(class_)
     table_name, column_names = _get_class_table(class_)
     columns_delete: Tuple[str] = tuple(col for col in column_names if col not in field_names)
     columns_add: Tuple[str] = tuple(col for col in field_names if col not in column_names)
-    records = _copy_records(class_, table_name)
-    _drop_table(class_, table_name)
-    _migrate_records(class_, records, columns_delete, columns_add, column_transfer)
+    column_transfer = column_transfer or {}
+    # columns that are kept, and columns whose data moves to one of the new columns,
+    # the other new columns get their default values
+    column_map: Dict[str, str] = {col: col for col in column_names if col in field_names}
+    column_map.update({
+        new: old for old, new in column_transfer.items()
+        if old in columns_delete and new in field_names
+    })
+    # build the new table next to the old one and swap them, renaming the old table
+    # instead would make the foreign keys of other tables follow it and then dangle
+    new_table: str = f"_{table_name}_new"
+    with connect(class_) as con:
+        cur: sql.Cursor = con.cursor()
+        # foreign keys can only be toggled outside of a transaction
+        foreign_keys: bool = not con.in_transaction and \
+            bool(cur.execute("PRAGMA foreign_keys;").fetchone()[0])
+        if foreign_keys:
+            cur.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            with _transaction(con):
+                _create_table(class_, cur, type_overload=getattr(class_, 'types_table'),
+                              table_name=new_table)
+                _copy_columns(cur, table_name, new_table, column_map)
+                cur.execute(f"DROP TABLE {table_name};")
+                cur.execute(f"ALTER TABLE {new_table} RENAME TO {table_name};")
+                if foreign_keys and cur.execute("PRAGMA foreign_key_check;").fetchone():
+                    raise sql.IntegrityError(f"Migrating {table_name} breaks foreign keys.")
+        finally:
+            if foreign_keys:
+                cur.execute("PRAGMA foreign_keys = ON;")
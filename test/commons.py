@@ -1,15 +1,79 @@
+import dataclasses
+import hashlib
+import os
+import sqlite3
+import tempfile
+import unittest
+from sqlite3 import Connection
+from typing import Sequence, Any
+
 # noinspection PyProtectedMember
-from datalite3.commons import _get_fields, DecoratedClass, connect, Key, _get_key_condition, \
-    _get_table_name
+from datalite3.commons import _get_field_names, DecoratedClass, connect, Key, _get_key_condition, \
+    _get_table_name, _configure_connection
+
+
+def getTempDBPath(test_case: unittest.TestCase, name: str = "test.db") -> str:
+    """
+    Get the path of a database in a temporary directory,
+    the directory is removed when the test is over.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    return os.path.join(directory.name, name)
+
+
+def getMemoryDB() -> Connection:
+    """
+    Open an in-memory database tuned like the connections opened by datalite,
+    in autocommit mode so that explicit transactions can be used.
+    """
+    conn = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+    _configure_connection(conn, ":memory:")
+    return conn
+
+
+# above this number of records, collections are compared through a digest of their rows
+HASH_COMPARISON_THRESHOLD = 10_000
+
+
+def hashRows(objects: Sequence[Any]) -> bytes:
+    """
+    Compute a digest of the values of the fields of some dataclass objects, in order.
+    """
+    digest = hashlib.blake2b()
+    for obj in objects:
+        row = tuple(getattr(obj, f.name) for f in dataclasses.fields(obj))
+        digest.update(repr(row).encode())
+    return digest.digest()
+
+
+def assertRowsEqual(test_case: unittest.TestCase, first: Sequence[Any], second: Sequence[Any]):
+    """
+    Assert that two collections of dataclass objects hold the same rows. Small collections
+    are compared directly to get a diff on failure, large ones through their digests.
+    """
+    if max(len(first), len(second)) <= HASH_COMPARISON_THRESHOLD:
+        test_case.assertEqual(first, second)
+        return
+    test_case.assertEqual(len(first), len(second))
+    test_case.assertEqual(hashRows(first), hashRows(second))
+
+
+def countRows(class_: DecoratedClass) -> int:
+    """
+    Count the records in the table of a decorated class.
+    """
+    with connect(class_) as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM {_get_table_name(class_)}').fetchone()[0]
 
 
 def getValFromDB(class_: DecoratedClass, key: Key):
-    condition: str = _get_key_condition(class_, key)
+    condition, key = _get_key_condition(class_, key)
     table_name: str = _get_table_name(class_)
     with connect(class_) as conn:
         cur = conn.cursor()
-        cur.execute(f'SELECT * FROM {table_name} WHERE {condition}')
-        field_names = list(map(lambda f: f.name, _get_fields(class_)))
+        cur.execute(f'SELECT * FROM {table_name} WHERE {condition}', key)
+        field_names = _get_field_names(class_)
         one = cur.fetchone()
         if one is None:
             raise ValueError(f"Entry with key {key} not found.")
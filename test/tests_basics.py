@@ -1,15 +1,25 @@
+import gc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
 import unittest
+import weakref
 from sqlite3 import Connection
 
 from dataclasses import dataclass, asdict
 
-from datalite3 import datalite
+from datalite3 import datalite, close_connections
+from datalite3.commons import SQLType, _get_schema, connect, _all_connections
 # Show full diff in unittest
 from test.commons import getValFromDB
 
 unittest.util._MAX_LENGTH = 2000
 
 db: Connection = Connection(":memory:")
+temp_dir = tempfile.TemporaryDirectory()
+db_path: str = os.path.join(temp_dir.name, "test.db")
 
 
 @datalite(db)
@@ -24,6 +34,29 @@ class TestClass:
         return asdict(self) == asdict(other)
 
 
+@datalite(db_path)
+@dataclass
+class FileTestClass:
+    integer_value: int = 1
+    str_value: str = 'a'
+
+
+@datalite(db, type_overload={list: SQLType.TEXT}, encoders={'tags': json.dumps})
+@dataclass
+class EncodedTestClass:
+    tags: list
+
+
+@datalite(db, slots=True)
+@dataclass
+class SlottedTestClass:
+    integer_value: int = 1
+    str_value: str = 'a'
+
+    def describe(self) -> str:
+        return f'slotted {super().__repr__()}'
+
+
 class DatabaseMain(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -40,6 +73,22 @@ class DatabaseMain(unittest.TestCase):
         from_db = getValFromDB(TestClass, self.test_object.__id__)
         self.assertEqual(self.test_object.integer_value, from_db.integer_value)
 
+    def test_update_quotes(self):
+        self.test_object.create_entry()
+        self.test_object.str_value = 'It\'s a "quoted" value'
+        self.test_object.update_entry()
+        from_db = getValFromDB(TestClass, self.test_object.__id__)
+        self.assertEqual(self.test_object.str_value, from_db.str_value)
+
+    def test_types_table_change(self):
+        types_table = TestClass.types_table
+        TestClass.types_table = {**types_table, int: SQLType.TEXT}
+        try:
+            self.assertEqual('TEXT', str(_get_schema(TestClass).fields[0].sql_type))
+        finally:
+            TestClass.types_table = types_table
+        self.assertEqual('INTEGER', str(_get_schema(TestClass).fields[0].sql_type))
+
     def test_delete(self):
         cur = db.cursor()
         cur.execute('SELECT * FROM testclass')
@@ -54,5 +103,95 @@ class DatabaseMain(unittest.TestCase):
         self.assertEqual(len(objects), init_len)
 
 
+class DatabaseFile(unittest.TestCase):
+
+    def test_creation(self):
+        test_object = FileTestClass(12, 'TestValue')
+        test_object.create_entry()
+        from_db = getValFromDB(FileTestClass, test_object.__id__)
+        self.assertEqual(test_object.str_value, from_db.str_value)
+
+    def test_update(self):
+        test_object = FileTestClass(12, 'TestValue')
+        test_object.create_entry()
+        test_object.integer_value = 40
+        test_object.update_entry()
+        from_db = getValFromDB(FileTestClass, test_object.__id__)
+        self.assertEqual(test_object.integer_value, from_db.integer_value)
+
+
+class DatabaseSlots(unittest.TestCase):
+
+    def test_no_dict(self):
+        test_object = SlottedTestClass(12, 'TestValue')
+        self.assertFalse(hasattr(test_object, '__dict__'))
+        self.assertRaises(AttributeError, setattr, test_object, 'unknown', 1)
+
+    def test_weakref(self):
+        test_object = SlottedTestClass(12, 'TestValue')
+        self.assertIs(weakref.ref(test_object)(), test_object)
+
+    def test_zero_argument_super(self):
+        test_object = SlottedTestClass(12, 'TestValue')
+        self.assertEqual(test_object.describe(), f'slotted {object.__repr__(test_object)}')
+
+    def test_lifecycle(self):
+        test_object = SlottedTestClass(12, 'TestValue')
+        test_object.create_entry()
+        test_object.integer_value = 40
+        test_object.update_entry()
+        from_db = getValFromDB(SlottedTestClass, test_object.__id__)
+        self.assertEqual(test_object.integer_value, from_db.integer_value)
+        test_object.remove_entry()
+        self.assertRaises(ValueError, getValFromDB, SlottedTestClass, test_object.__id__)
+
+
+class DatabaseConnections(unittest.TestCase):
+
+    def test_close_connections(self):
+        FileTestClass(12, 'TestValue').create_entry()
+        with connect(FileTestClass) as conn:
+            pass
+        close_connections()
+        self.assertRaises(sqlite3.ProgrammingError, conn.execute, 'SELECT 1')
+        # the connection is opened again on its next use
+        test_object = FileTestClass(13, 'TestValue')
+        test_object.create_entry()
+        self.assertEqual(13, getValFromDB(FileTestClass, test_object.__id__).integer_value)
+
+    def test_thread_connections(self):
+        thread = threading.Thread(target=lambda: FileTestClass(12, 'TestValue').create_entry())
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+        # only the connections of the threads that are alive are kept
+        self.assertLessEqual(len(_all_connections), 1)
+
+
+class DatabaseEncoders(unittest.TestCase):
+
+    def test_creation(self):
+        test_object = EncodedTestClass(['a', 'b'])
+        test_object.create_entry()
+        cur = db.cursor()
+        cur.execute('SELECT tags FROM encodedtestclass WHERE __id__ = ?', (test_object.__id__,))
+        self.assertEqual(json.dumps(['a', 'b']), cur.fetchone()[0])
+
+    def test_unknown_field(self):
+        def decorate():
+            @datalite(db, encoders={'unknown': str})
+            @dataclass
+            class UnknownEncodedClass:
+                value: int
+
+        self.assertRaises(ValueError, decorate)
+
+
+def tearDownModule():
+    close_connections()
+    temp_dir.cleanup()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,7 +4,8 @@ from sqlite3 import Connection
 from dataclasses import dataclass, asdict
 
 from datalite3 import datalite
-from datalite3.fetch import fetch_from, fetch_equals, fetch_all, fetch_if, fetch_where
+from datalite3.fetch import fetch_from, fetch_equals, fetch_all, fetch_if, fetch_where, \
+    fetch_all_columnar
 
 # Show full diff in unittest
 unittest.util._MAX_LENGTH = 2000
@@ -43,6 +44,12 @@ class DatabaseFetchCalls(unittest.TestCase):
         t_objs = fetch_all(FetchClass)
         self.assertEqual(tuple(self.objs), t_objs)
 
+    def testFetchAllColumnar(self):
+        columns = fetch_all_columnar(FetchClass)
+        self.assertEqual(tuple(obj.ordinal for obj in self.objs), columns['ordinal'])
+        self.assertEqual(tuple(obj.str_ for obj in self.objs), columns['str_'])
+        self.assertEqual(tuple(obj.__id__ for obj in self.objs), columns['__id__'])
+
     def testFetchIf(self):
         t_objs = fetch_if(FetchClass, "str_ = \"b\"")
         self.assertEqual(tuple(self.objs[1:]), t_objs)
@@ -51,6 +58,10 @@ class DatabaseFetchCalls(unittest.TestCase):
         t_objs = fetch_where(FetchClass, 'str_', 'b')
         self.assertEqual(tuple(self.objs[1:]), t_objs)
 
+    def testFetchWhereQuotes(self):
+        t_objs = fetch_where(FetchClass, 'str_', 'b\' OR \'1\' = \'1')
+        self.assertEqual(tuple(), t_objs)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,27 +1,46 @@
+import os
 import sqlite3
+import tempfile
 import unittest
 from sqlite3 import Connection
 
 from dataclasses import dataclass
 
-from datalite3 import datalite
-from datalite3.constraints import Primary
+from datalite3 import datalite, close_connections
+from datalite3.commons import connect
+from datalite3.constraints import Primary, ConstraintFailedError
 from datalite3.decorator import remove_all
 from datalite3.fetch import fetch_all
-from datalite3.mass_actions import create_many
+from datalite3.mass_actions import create_many, create_many_raw, remove_many, copy_many, \
+    copy_all, HeterogeneousCollectionError
+from test.commons import getMemoryDB, assertRowsEqual, countRows, getTempDBPath
 
 # Show full diff in unittest
 unittest.util._MAX_LENGTH = 2000
 
-db: Connection = sqlite3.connect(":memory:")
+db: Connection = getMemoryDB()
+temp_dir = tempfile.TemporaryDirectory()
+db_path: str = os.path.join(temp_dir.name, "mass.db")
 
 
-@datalite(db)
+@datalite(db, slots=True)
 @dataclass
 class MassCommit:
     str_: Primary[str]
 
 
+@datalite(db_path)
+@dataclass
+class FileCommit:
+    str_: Primary[str]
+
+
+@datalite(db)
+@dataclass
+class EmptyCommit:
+    pass
+
+
 class DatabaseMassInsert(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -31,16 +50,128 @@ class DatabaseMassInsert(unittest.TestCase):
         # create some initial objects
         start_len = 2
         [MassCommit(f'dog {i}').create_entry() for i in range(start_len)]
-        start_tup = fetch_all(MassCommit)
-        self.assertEqual(len(start_tup), start_len)
+        self.assertEqual(countRows(MassCommit), start_len)
         # copy some more objects
         create_many(self.objs)
-        _objs = fetch_all(MassCommit)
-        self.assertEqual(_objs, start_tup + tuple(self.objs))
+        self.assertEqual(countRows(MassCommit), start_len + len(self.objs))
+        created = [obj for obj in fetch_all(MassCommit) if not obj.str_.startswith('dog ')]
+        assertRowsEqual(self, sorted(created, key=lambda obj: obj.str_),
+                        sorted(self.objs, key=lambda obj: obj.str_))
+
+    def testMassCreateUnprotected(self):
+        create_many(self.objs, protect_memory=False)
+        self.assertEqual(fetch_all(MassCommit), tuple(self.objs))
+
+    def testMassCreateUnprotectedRestoresSettings(self):
+        create_many([FileCommit(obj.str_) for obj in self.objs], protect_memory=False)
+        with connect(FileCommit) as con:
+            self.assertEqual(con.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(con.execute('PRAGMA synchronous').fetchone()[0], 1)
+        self.assertEqual(countRows(FileCommit), len(self.objs))
+        remove_all(FileCommit)
+
+    def testMassCreateRollback(self):
+        self.assertRaises(ConstraintFailedError, create_many, self.objs + self.objs[:1])
+        self.assertEqual(fetch_all(MassCommit), tuple())
+
+    def testMassCreateBatches(self):
+        create_many(self.objs, batch_size=2)
+        self.assertEqual(fetch_all(MassCommit), tuple(self.objs))
+
+    def testMassCreateManyStatements(self):
+        # more rows than fit in a single multi-row INSERT statement
+        objs = [MassCommit(f'bird {i}') for i in range(12_000)]
+        create_many(objs)
+        assertRowsEqual(self, fetch_all(MassCommit), tuple(objs))
+
+    def testMassCreateRaw(self):
+        create_many_raw(MassCommit, ((obj.str_,) for obj in self.objs))
+        self.assertEqual(fetch_all(MassCommit), tuple(self.objs))
+
+    def testMassCreateRawWrongLength(self):
+        self.assertRaises(ValueError, create_many_raw, MassCommit, [('cat', 'dog')])
+        self.assertEqual(fetch_all(MassCommit), tuple())
+
+    def testMassCopy(self):
+        db_path = getTempDBPath(self, 'other.db')
+        statements = []
+        db.set_trace_callback(statements.append)
+        try:
+            copy_many(self.objs, db_path, False)
+        finally:
+            db.set_trace_callback(None)
+        # memory protection is lifted on the database the records are copied to
+        self.assertIn('PRAGMA datalite_copy.synchronous = OFF;', statements)
+        self.assertNotIn('PRAGMA main.synchronous = OFF;', statements)
+        with sqlite3.connect(db_path) as other:
+            rows = other.execute('SELECT str_ FROM masscommit').fetchall()
+        other.close()
+        self.assertEqual(rows, [(obj.str_,) for obj in self.objs])
+        self.assertEqual(fetch_all(MassCommit), tuple())
+
+    def testMassCopyAll(self):
+        db_path = getTempDBPath(self, 'other.db')
+        create_many(self.objs)
+        copy_all(MassCommit, db_path)
+        with sqlite3.connect(db_path) as other:
+            rows = other.execute('SELECT str_ FROM masscommit').fetchall()
+        other.close()
+        self.assertEqual(sorted(rows), sorted((obj.str_,) for obj in self.objs))
+
+    def testMassCreateRawNoFields(self):
+        create_many_raw(EmptyCommit, [(), ()])
+        self.assertEqual(countRows(EmptyCommit), 2)
+        self.assertRaises(ValueError, create_many_raw, EmptyCommit, [('cat',)])
+        self.assertEqual(countRows(EmptyCommit), 2)
+        remove_all(EmptyCommit)
+
+    def testMassRemove(self):
+        create_many(self.objs)
+        remove_many(self.objs[1:])
+        self.assertEqual(fetch_all(MassCommit), tuple(self.objs[:1]))
+
+    def testMassCreateRollbackKeepsOpenTransaction(self):
+        db.execute('CREATE TABLE IF NOT EXISTS log (message TEXT)')
+        db.execute('BEGIN')
+        db.execute("INSERT INTO log VALUES ('before')")
+        self.assertRaises(ConstraintFailedError, create_many, self.objs + self.objs[:1])
+        self.assertTrue(db.in_transaction)
+        self.assertEqual(db.execute('SELECT COUNT(*) FROM log').fetchone()[0], 1)
+        self.assertEqual(countRows(MassCommit), 0)
+        db.rollback()
+
+    def testMassCopyOpenTransaction(self):
+        db_path = getTempDBPath(self, 'other.db')
+        db.execute('BEGIN')
+        self.assertRaises(sqlite3.OperationalError, copy_many, self.objs, db_path)
+        self.assertRaises(sqlite3.OperationalError, copy_all, MassCommit, db_path)
+        self.assertTrue(db.in_transaction)
+        db.rollback()
+        # the database was not left attached
+        self.assertEqual(['main'], [row[1] for row in db.execute('PRAGMA database_list')])
+        copy_many(self.objs, db_path)
+
+    def testMassCreateHeterogeneous(self):
+        self.assertRaises(HeterogeneousCollectionError, create_many, self.objs + [object()])
+        self.assertEqual(fetch_all(MassCommit), tuple())
+
+    def testMassCreateGenerator(self):
+        create_many(obj for obj in self.objs)
+        self.assertEqual(fetch_all(MassCommit), tuple(self.objs))
+
+    def testMassCreateEmpty(self):
+        self.assertRaises(ValueError, create_many, [])
+        self.assertRaises(ValueError, create_many, (obj for obj in []))
 
     def tearDown(self) -> None:
         remove_all(MassCommit)
 
 
+def tearDownModule():
+    db.close()
+    close_connections()
+    temp_dir.cleanup()
+
+
 if __name__ == '__main__':
     unittest.main()
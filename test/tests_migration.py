@@ -5,22 +5,24 @@ from sqlite3 import Connection
 from datalite3 import datalite
 from datalite3.constraints import Unique
 from datalite3.fetch import fetch_all
+from datalite3.mass_actions import create_many, remove_many
 from datalite3.migrations import basic_migrate, _drop_table
+from test.commons import getMemoryDB
 
 # Show full diff in unittest
 unittest.util._MAX_LENGTH = 2000
 
-db: Connection = Connection(":memory:")
+db: Connection = getMemoryDB()
 
 
-@datalite(db)
+@datalite(db, slots=True)
 @dataclass
 class Migrate1:
     ordinal: int
     conventional: str
 
 
-@datalite(db)
+@datalite(db, slots=True)
 @dataclass
 class Migrate2:
     cardinal: Unique[int] = 1
@@ -31,7 +33,7 @@ class DatabaseMigration(unittest.TestCase):
 
     def setUp(self) -> None:
         self.objs = [Migrate1(i, "a") for i in range(10)]
-        [obj.create_entry() for obj in self.objs]
+        create_many(self.objs)
 
     def testBasicMigrate(self):
         global Migrate1
@@ -44,9 +46,39 @@ class DatabaseMigration(unittest.TestCase):
 
     def tearDown(self) -> None:
         t_objs = fetch_all(Migrate1)
-        [obj.remove_entry() for obj in t_objs]
+        remove_many(t_objs)
         _drop_table(Migrate1, 'migrate1')
 
 
+class DatabaseMigrationForeignKeys(unittest.TestCase):
+
+    def testMigrateKeepsForeignKeys(self):
+        @datalite(db, 'parent')
+        @dataclass
+        class Parent:
+            name: str
+
+        Parent('a').create_entry()
+        db.execute('CREATE TABLE parent_child (parent INTEGER REFERENCES parent(__id__))')
+
+        @datalite(db, 'parent')
+        @dataclass
+        class NewParent:
+            name: str
+            age: int = 0
+
+        basic_migrate(NewParent)
+        child_sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'parent_child'").fetchone()[0]
+        self.assertIn('REFERENCES parent(', child_sql)
+        self.assertEqual([(1, 'a', 0)], db.execute('SELECT __id__, name, age FROM parent').fetchall())
+        db.execute('DROP TABLE parent_child')
+        _drop_table(NewParent, 'parent')
+
+
+def tearDownModule():
+    db.close()
+
+
 if __name__ == '__main__':
     unittest.main()
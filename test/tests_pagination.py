@@ -5,6 +5,7 @@ from sqlite3 import Connection
 
 from datalite3 import datalite
 from datalite3.fetch import fetch_all, fetch_if, fetch_where
+from datalite3.mass_actions import remove_many
 
 # Show full diff in unittest
 unittest.util._MAX_LENGTH = 2000
@@ -41,7 +42,7 @@ class DatabaseFetchPaginationCalls(unittest.TestCase):
         self.assertEqual(tuple(self.objs[:5]), t_objs)
 
     def tearDown(self) -> None:
-        [obj.remove_entry() for obj in self.objs]
+        remove_many(self.objs)
 
 
 if __name__ == '__main__':